@@ -34,27 +34,98 @@ dimensions you may need to adjust the constants at the top of the script.
 Requirements
 ------------
 
-This script uses only Python’s standard library (``zipfile``, ``argparse``,
-``base64``, etc.), so no third‑party dependencies are needed.  It should
-work on macOS, Linux or Windows, provided Python 3.6+ is installed.
+This script only requires Python’s standard library (``zipfile``,
+``argparse``, ``base64``, etc.).  If the optional ``pybase64`` package is
+installed it is used to encode fonts and images, which is considerably faster
+for large assets.  It should work on macOS, Linux or Windows, provided
+Python 3.6+ is installed.
 """
 
 import argparse
-import base64
+import collections
+import concurrent.futures
+import hashlib
+import itertools
 import mimetypes
 import os
+import posixpath
 import re
 import sys
-import tempfile
 import zipfile
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    # SIMD-accelerated drop-in replacement for the standard base64 module.
+    import pybase64 as _b64
+    _b64encode_str = _b64.b64encode_as_string
+    # pybase64 releases the GIL while encoding, so chunks of one large asset
+    # can be encoded on several threads at once.
+    _B64_RELEASES_GIL = True
+except ImportError:
+    import base64 as _b64
+    _B64_RELEASES_GIL = False
+
+    def _b64encode_str(data: bytes) -> str:
+        return _b64.b64encode(data).decode('ascii')
 
 
 # Constants for page dimensions (A4 in points as exported by Pages)
 PAGE_WIDTH = 595.28
 PAGE_HEIGHT = 841.89
 
+# MIME types of the fonts and images that get inlined, keyed by lowercase
+# file extension.
+_FONT_MIME = {
+    'ttf': 'font/ttf',
+    'otf': 'font/otf',
+    'woff': 'font/woff',
+    'woff2': 'font/woff2',
+}
+_IMAGE_MIME = {
+    'gif': 'image/gif',
+    'png': 'image/png',
+    'jpg': 'image/jpeg',
+    'jpeg': 'image/jpeg'
+}
+
+# Label and opening container of a page in the final document; lines are
+# joined with '\n' like the other document parts.
+_PAGE_HEADER = '<p class="page-label">Page %d</p>\n<div class="page page-%d" id="page-%d">'
+
+# Assets at least this large are split into chunks that are base64 encoded
+# concurrently.  The chunk size is a multiple of 3 so that the encoded chunks
+# concatenate into valid base64 without padding in between.
+_PARALLEL_B64_MIN = 2 << 20
+_B64_CHUNK = 3 << 18
+
+# Non‑void elements whose XHTML self‑closing form (``<div/>``) must be
+# rewritten as an explicit open/close pair in HTML.
+_NON_VOID_TAGS = [
+    'div', 'span', 'p', 'bdi', 'a', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6',
+    'section', 'article', 'header', 'footer', 'li', 'ul', 'ol', 'table',
+    'tbody', 'td', 'tr', 'th', 'strong', 'em', 'b', 'i', 'small', 'big',
+    'sup', 'sub', 'u'
+]
+
+# Patterns compiled once at import time rather than on every page.
+_DIGITS_RE = re.compile(r'(\d+)')
+_SELF_CLOSING_RE = re.compile(r'<(' + '|'.join(_NON_VOID_TAGS) + r')(\b[^>]*)/>')
+_SRC_RE = re.compile(r'src="images/([^"/]+)"')
+_URL_RE = re.compile(r'url\(images/([^\)]+)\)')
+_FONT_URL_RE = re.compile(r'url\([^\)]+\/fonts\/([^\)]+)\)')
+_FONT_URL_REL_RE = re.compile(r'url\(fonts\/([^\)]+)\)')
+_HREF_RE = re.compile(r'href="page-(\d+)\.xhtml"')
+# All page rewrites combined into a single alternation so that each page body
+# is scanned once.  Groups: 1-2 self‑closing tag, 3 src image, 4 url() image,
+# 5 linked page number.  Every branch starts with a literal ('<', 's', 'u' or
+# 'h'), which lets the regex engine skip straight to candidate positions much
+# like a keyword automaton would; most of the rewrite time is spent copying
+# the inlined data URIs, not scanning.
+_PAGE_REWRITE_RE = re.compile('|'.join(
+    p.pattern for p in (_SELF_CLOSING_RE, _SRC_RE, _URL_RE, _HREF_RE)
+))
+
 
 def natural_sort_key(s: str) -> List:
     """Return a list that can be used as a key for natural sorting.
@@ -62,58 +133,192 @@ def natural_sort_key(s: str) -> List:
     Splits the string into digit and non‑digit parts so that 'page-10'
     sorts after 'page-9'.
     """
-    return [int(text) if text.isdigit() else text for text in re.split(r'(\d+)', s)]
+    return [int(text) if text.isdigit() else text for text in _DIGITS_RE.split(s)]
 
 
-def find_pages(root: Path) -> List[Path]:
-    """Search for page files matching 'page-*.xhtml' under the given root.
+def _page_sort_key(name: str) -> List:
+    """Return :func:`natural_sort_key` of the basename of a page file.
+
+    Names of the usual ``page-<N>.xhtml`` form produce the same key directly,
+    without splitting the string with a regex.
+    """
+    base = name.rpartition('/')[2]
+    number = base[5:-6]
+    if number.isdecimal():
+        return ['page-', int(number), '.xhtml']
+    return natural_sort_key(base)
+
+
+def _decode_text(data: bytes) -> str:
+    """Decode UTF‑8 text read from the archive with universal newlines.
+
+    Matches what ``Path.read_text`` did when the ePub was extracted to disk:
+    ``\r\n`` and lone ``\r`` line endings become ``\n``.
+    """
+    text = data.decode('utf-8')
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
+
+
+def _index_archive(zf: zipfile.ZipFile) -> Dict[str, List[str]]:
+    """Group the file entries of the archive by their parent directory.
 
-    The function returns a list of Path objects sorted naturally by the numeric
-    part of the filename.
+    Keys are directory paths inside the archive without a trailing slash (the
+    empty string denotes the archive root); values are full archive names in
+    archive order.  The archive listing is walked only once.
     """
-    pages = list(root.rglob('page-*.xhtml'))
-    return sorted(pages, key=lambda p: natural_sort_key(p.name))
+    index: Dict[str, List[str]] = collections.defaultdict(list)
+    for info in zf.infolist():
+        if not info.is_dir():
+            index[info.filename.rpartition('/')[0]].append(info.filename)
+    return index
 
 
-def read_css(root: Path) -> str:
+def find_pages(index: Dict[str, List[str]], root: str) -> List[str]:
+    """Search for page files matching 'page-*.xhtml' under the given root.
+
+    The function returns a list of archive names sorted naturally by the
+    numeric part of the filename.
+    """
+    prefix = root + '/' if root else ''
+    pages = []
+    for directory, names in index.items():
+        if directory != root and not directory.startswith(prefix):
+            continue
+        for name in names:
+            base = name.rpartition('/')[2]
+            if base.startswith('page-') and base.endswith('.xhtml'):
+                pages.append(name)
+    return sorted(pages, key=_page_sort_key)
+
+
+def read_css(zf: zipfile.ZipFile, index: Dict[str, List[str]], root: str) -> str:
     """Read and concatenate all CSS files under root/css.
 
     If no CSS directory is found, returns an empty string.
     """
-    css_root = root / 'css'
-    css_dir = next((p for p in css_root.iterdir() if p.is_dir()), None) if css_root.exists() else None
-    if css_dir is None and css_root.exists():
-        # css is a directory itself
-        css_dir = css_root
+    css_root = posixpath.join(root, 'css')
+    prefix = css_root + '/'
+    # Use the first subdirectory of css/ if there is one, otherwise css/
+    # itself.
+    css_dir = next(
+        (prefix + d[len(prefix):].split('/', 1)[0] for d in index if d.startswith(prefix)),
+        css_root,
+    )
     css = []
-    if css_dir and css_dir.exists():
-        for file in css_dir.iterdir():
-            if file.suffix.lower() in {'.css', '.scss'}:
-                css.append(file.read_text(encoding='utf-8'))
+    for name in index.get(css_dir, []):
+        if posixpath.splitext(name)[1].lower() in {'.css', '.scss'}:
+            css.append(_decode_text(zf.read(name)))
     return '\n'.join(css)
 
 
-def embed_fonts(css: str, fonts_dir: Path) -> str:
+def _data_uri(mime: str, data: bytes,
+              pool: Optional[concurrent.futures.Executor] = None) -> str:
+    """Return ``data`` as a base64 ``data:`` URI with the given MIME type.
+
+    The encoder produces a ``str`` directly when ``pybase64`` is available,
+    avoiding an intermediate ``bytes`` → ``str`` copy for large assets.  If a
+    thread ``pool`` is given, assets of at least ``_PARALLEL_B64_MIN`` bytes
+    are encoded in chunks spread over its threads.
+    """
+    if pool is not None and len(data) >= _PARALLEL_B64_MIN:
+        view = memoryview(data)
+        chunks = [view[i:i + _B64_CHUNK] for i in range(0, len(data), _B64_CHUNK)]
+        encoded = ''.join(pool.map(_b64encode_str, chunks))
+    else:
+        encoded = _b64encode_str(data)
+    return 'data:' + mime + ';base64,' + encoded
+
+
+def _read_assets(zf: zipfile.ZipFile,
+                 assets: List[Tuple[str, str, str]]) -> Iterator[Tuple[str, tuple, str, Optional[bytes]]]:
+    """Read ``(key, mime, archive name)`` triples from the archive one at a time.
+
+    Yields ``(key, ident, mime, data)`` where ``ident`` identifies the content
+    of the asset; ``data`` is ``None`` for an asset byte‑identical to one
+    already yielded (fixed‑layout exports often repeat the same page
+    decoration under different names).
+    """
+    infos = [zf.getinfo(name) for _, _, name in assets]
+    # Size and CRC from the central directory are free; only entries that
+    # share them with another entry are hashed to confirm they are identical.
+    signatures = [(mime, info.file_size, info.CRC) for (_, mime, _), info in zip(assets, infos)]
+    candidates = {sig for sig, count in collections.Counter(signatures).items() if count > 1}
+
+    seen = set()
+    for (key, mime, _), info, sig in zip(assets, infos, signatures):
+        data = zf.read(info)
+        ident = sig + (hashlib.blake2b(data, digest_size=16).digest(),) if sig in candidates else sig
+        if ident in seen:
+            yield key, ident, mime, None
+        else:
+            seen.add(ident)
+            yield key, ident, mime, data
+
+
+def _encode_assets(zf: zipfile.ZipFile, assets: List[Tuple[str, str, str]]) -> Dict[str, str]:
+    """Encode ``(key, mime, archive name)`` triples into a key → data URI mapping.
+
+    Byte‑identical assets are encoded once and share a single data URI
+    string.  Each asset is encoded as soon as it has been read, so that only
+    its encoded form is kept.  On multi‑core machines, when the encoder
+    releases the GIL, the assets are encoded concurrently on a thread pool
+    (very large assets are additionally split into chunks), with only a
+    couple of assets per worker in flight; otherwise they are encoded inline.
+    """
+    uris: Dict[tuple, str] = {}
+    keys: List[Tuple[str, tuple]] = []
+    workers = os.cpu_count() or 1
+    if workers > 1 and _B64_RELEASES_GIL:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as pool:
+            pending: collections.deque = collections.deque()
+            try:
+                for key, ident, mime, data in _read_assets(zf, assets):
+                    keys.append((key, ident))
+                    if data is None:
+                        continue
+                    if len(data) >= _PARALLEL_B64_MIN:
+                        # Large assets are encoded from this thread, with
+                        # their chunks spread over the pool.
+                        uris[ident] = _data_uri(mime, data, pool)
+                        continue
+                    pending.append((ident, pool.submit(_data_uri, mime, data)))
+                    if len(pending) >= 2 * workers:
+                        ident, future = pending.popleft()
+                        uris[ident] = future.result()
+                while pending:
+                    ident, future = pending.popleft()
+                    uris[ident] = future.result()
+            finally:
+                for _, future in pending:
+                    future.cancel()
+    else:
+        for key, ident, mime, data in _read_assets(zf, assets):
+            keys.append((key, ident))
+            if data is not None:
+                uris[ident] = _data_uri(mime, data)
+    return {key: uris[ident] for key, ident in keys}
+
+
+def embed_fonts(css: str, zf: zipfile.ZipFile, font_files: List[str]) -> str:
     """Replace font URLs in the CSS with base64 data URIs.
 
-    Only ``.ttf``, ``.otf``, ``.woff`` and ``.woff2`` files are considered.  If a
+    ``font_files`` lists the archive names of the candidate font files.  Only
+    ``.ttf``, ``.otf``, ``.woff`` and ``.woff2`` files are considered.  If a
     referenced font cannot be found, the original URL is left unchanged.
     """
+    # Both URL patterns below contain 'fonts/'; without it there is nothing
+    # to replace, so skip reading and encoding the fonts altogether.
+    if 'fonts/' not in css:
+        return css
     # Preload and encode fonts
-    font_data: Dict[str, str] = {}
-    if fonts_dir.exists():
-        for font_file in fonts_dir.iterdir():
-            if font_file.is_file():
-                ext = font_file.suffix.lstrip('.').lower()
-                mime = {
-                    'ttf': 'font/ttf',
-                    'otf': 'font/otf',
-                    'woff': 'font/woff',
-                    'woff2': 'font/woff2',
-                }.get(ext)
-                if mime:
-                    encoded = base64.b64encode(font_file.read_bytes()).decode('ascii')
-                    font_data[font_file.name] = f'data:{mime};base64,{encoded}'
+    fonts: List[Tuple[str, str, str]] = []
+    for font_file in font_files:
+        mime = _FONT_MIME.get(font_file.rpartition('.')[2].lower())
+        if mime:
+            fonts.append((font_file.rpartition('/')[2], mime, font_file))
+    font_data = _encode_assets(zf, fonts)
 
     def repl(match: re.Match[str]) -> str:
         font_path = match.group(1)
@@ -121,166 +326,257 @@ def embed_fonts(css: str, fonts_dir: Path) -> str:
         uri = font_data.get(fname)
         return f'url({uri})' if uri else match.group(0)
 
+    # The usual url(fonts/filename) and url(../fonts/filename) references to
+    # known fonts are replaced in a single pass over the stylesheet, split on
+    # 'url('; the regexes below only run if some other reference to fonts/
+    # is left over.
+    pieces = css.split('url(')
+    leftover = 'fonts/' in pieces[0]
+    for i in range(1, len(pieces)):
+        piece = pieces[i]
+        if piece.startswith('fonts/'):
+            start = 6
+        elif piece.startswith('../fonts/'):
+            start = 9
+        else:
+            start = 0
+        end = piece.find(')')
+        uri = font_data.get(piece[start:end]) if start and end > 0 else None
+        if uri:
+            pieces[i] = uri + piece[end:]
+            piece = piece[end:]
+        leftover = leftover or 'fonts/' in piece
+    css = 'url('.join(pieces)
+    if not leftover:
+        return css
+
     # Replace url(..fonts/filename)
-    css = re.sub(r'url\([^\)]+\/fonts\/([^\)]+)\)', repl, css)
+    css = _FONT_URL_RE.sub(repl, css)
     # Also replace url(fonts/filename)
-    css = re.sub(r'url\(fonts\/([^\)]+)\)', repl, css)
+    css = _FONT_URL_REL_RE.sub(repl, css)
     return css
 
 
-def encode_images(images_dir: Path) -> Dict[str, str]:
+def encode_images(zf: zipfile.ZipFile, image_files: List[str]) -> Dict[str, str]:
     """Return a mapping from image filename to data URI.
 
+    ``image_files`` lists the archive names of the candidate image files.
+
     Supports GIF, PNG and JPEG.  Other types are ignored.
     """
-    data = {}
-    if images_dir.exists():
-        for img in images_dir.iterdir():
-            if not img.is_file():
-                continue
-            ext = img.suffix.lower().lstrip('.')
-            mime = {
-                'gif': 'image/gif',
-                'png': 'image/png',
-                'jpg': 'image/jpeg',
-                'jpeg': 'image/jpeg'
-            }.get(ext)
-            if mime:
-                encoded = base64.b64encode(img.read_bytes()).decode('ascii')
-                data[img.name] = f'data:{mime};base64,{encoded}'
-    return data
-
-
-def fix_self_closing(html: str) -> str:
-    """Convert self‑closing tags for non‑void elements into proper open/close tags.
+    assets: List[Tuple[str, str, str]] = []
+    for img in image_files:
+        mime = _IMAGE_MIME.get(img.rpartition('.')[2].lower())
+        if mime:
+            assets.append((img.rpartition('/')[2], mime, img))
+    return _encode_assets(zf, assets)
 
-    XHTML exported by Pages sometimes contains ``<div/>`` or ``<span/>``, which
-    are invalid in HTML and confuse browsers.  This function replaces those
-    patterns with ``<div></div>`` and ``<span></span>``.  Void elements
-    (e.g. ``<img/>``) are left untouched.
+
+def extract_body_content(zf: zipfile.ZipFile, page_name: str) -> str:
+    """Extract the HTML between <body> and </body> from an XHTML page.
+
+    The delimiters are located on the raw bytes with plain substring searches
+    (the first ``<body…>`` and the last ``</body>``), so only the body itself
+    gets decoded.
     """
-    non_void = [
-        'div', 'span', 'p', 'bdi', 'a', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6',
-        'section', 'article', 'header', 'footer', 'li', 'ul', 'ol', 'table',
-        'tbody', 'td', 'tr', 'th', 'strong', 'em', 'b', 'i', 'small', 'big',
-        'sup', 'sub', 'u'
-    ]
-    pattern = re.compile(r'<(' + '|'.join(non_void) + r')(\b[^>]*)/>')
-    return pattern.sub(lambda m: f'<{m.group(1)}{m.group(2)}></{m.group(1)}>', html)
-
-
-def replace_images_in_html(html: str, images: Dict[str, str]) -> str:
-    """Replace relative image sources in the HTML with base64 data URIs."""
-    def repl_src(m: re.Match[str]) -> str:
-        fname = m.group(1)
-        uri = images.get(fname)
-        return f'src="{uri}"' if uri else m.group(0)
-
-    def repl_url(m: re.Match[str]) -> str:
-        fname = m.group(1)
-        uri = images.get(fname)
-        return f'url({uri})' if uri else m.group(0)
-
-    html = re.sub(r'src="images/([^"/]+)"', repl_src, html)
-    html = re.sub(r'url\(images/([^\)]+)\)', repl_url, html)
-    return html
-
-
-def extract_body_content(page_path: Path) -> str:
-    """Extract the HTML between <body> and </body> from an XHTML page."""
-    text = page_path.read_text(encoding='utf-8')
-    m = re.search(r'<body[^>]*>(.*)</body>', text, re.DOTALL)
-    if not m:
+    data = zf.read(page_name)
+    start = data.find(b'<body')
+    if start < 0:
+        return ''
+    start = data.find(b'>', start) + 1
+    end = data.rfind(b'</body>')
+    if start == 0 or end < start:
         return ''
-    body = m.group(1).strip()
+    body = _decode_text(data[start:end]).strip()
     return body
 
 
-def build_html_document(pages: List[str], css: str, title: str) -> str:
-    """Assemble the final HTML document from page contents and CSS.
+class _PageRewriter:
+    """Replacement callback for ``_PAGE_REWRITE_RE`` bound to an image mapping."""
+
+    __slots__ = ('images',)
+
+    def __init__(self, images: Dict[str, str]) -> None:
+        self.images = images
+
+    def __call__(self, m: re.Match[str]) -> str:
+        kind = m.lastindex
+        if kind == 2:
+            # Attributes of a self‑closing tag may themselves hold image
+            # references or page links.
+            tag, attrs = m.group(1, 2)
+            if attrs:
+                attrs = _PAGE_REWRITE_RE.sub(self, attrs)
+            return f'<{tag}{attrs}></{tag}>'
+        if kind == 3:
+            uri = self.images.get(m.group(3))
+            return f'src="{uri}"' if uri else m.group(0)
+        if kind == 4:
+            uri = self.images.get(m.group(4))
+            return f'url({uri})' if uri else m.group(0)
+        return f'href="#page-{m.group(5)}"'
+
+
+def rewrite_page(html: str, images: Dict[str, str]) -> str:
+    """Apply all page rewrites to ``html`` in a single regex pass.
+
+    XHTML exported by Pages sometimes contains ``<div/>`` or ``<span/>``, which
+    are invalid in HTML and confuse browsers; such self-closing non-void
+    elements become ``<div></div>`` and ``<span></span>``, while void elements
+    (e.g. ``<img/>``) are left untouched.  Relative image references
+    (``src="images/…"`` and ``url(images/…)``) are replaced with the data URIs
+    in ``images``, and ``href="page-N.xhtml"`` links become ``href="#page-N"``.
+    """
+    # Every rewrite needs one of these substrings; pages without any of them
+    # are returned without running the regex.
+    if '/>' not in html and 'images/' not in html and 'href="page-' not in html:
+        return html
+    return _PAGE_REWRITE_RE.sub(_PageRewriter(images), html)
+
+
+def _process_page(zf: zipfile.ZipFile, page: str, images: Dict[str, str]) -> str:
+    """Return the processed body of a single page, or '' if it has none."""
+    body = extract_body_content(zf, page)
+    if not body:
+        return ''
+    return rewrite_page(body, images)
+
+
+def _iter_processed_pages(zf: zipfile.ZipFile, page_files: List[str],
+                          images: Dict[str, str]) -> Iterator[str]:
+    """Yield the processed bodies of the non‑empty pages, in page order.
+
+    Pages are independent of each other, so they are processed concurrently,
+    but only a couple of pages per worker are kept in flight ahead of the
+    consumer so that memory does not grow with the size of the book.
+    """
+    workers = os.cpu_count() or 1
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        pending: collections.deque = collections.deque()
+        try:
+            for page in page_files:
+                pending.append(executor.submit(_process_page, zf, page, images))
+                if len(pending) >= 2 * workers:
+                    body = pending.popleft().result()
+                    if body:
+                        yield body
+            while pending:
+                body = pending.popleft().result()
+                if body:
+                    yield body
+        finally:
+            # On error or early close, drop the pages that have not started;
+            # leaving the executor waits for the ones already running.
+            for future in pending:
+                future.cancel()
+
+
+def _html_document_parts(pages: Iterable[str], css: str, title: str) -> Iterator[str]:
+    """Yield the lines of the final HTML document, without newlines.
 
     The `title` is used both for the <title> element and the visible <h1> header.
+    ``pages`` is consumed lazily, one page at a time.
     """
     # Basic escaping for the title
     safe_title = title.replace('<', '&lt;').replace('>', '&gt;')
 
-    parts: List[str] = []
-    parts.append('<!DOCTYPE html>')
-    parts.append('<html lang="fr">')
-    parts.append('<head>')
-    parts.append('<meta charset="utf-8">')
-    parts.append(f'<title>{safe_title}</title>')
-    parts.append('<style>')
-    parts.append(css)
-    parts.append('html, body { margin:0; padding:0; background:#111; font-family: system-ui, -apple-system, BlinkMacSystemFont, "Segoe UI", sans-serif; }')
-    parts.append('body { position: static !important; }')
-    parts.append('.wrapper { max-width: 635px; margin:0 auto; padding:2rem 0; }')
-    parts.append('h1 { color:#f5f5f5; text-align:center; margin-bottom:2rem; font-size:1.5rem; font-weight:600; }')
-    parts.append('.page-label { color:#ccc; text-align:center; margin:0 0 .5rem; font-size:0.85rem; letter-spacing:0.08em; text-transform:uppercase; }')
-    parts.append(f'.page {{ position: relative; width: {PAGE_WIDTH}px; height: {PAGE_HEIGHT}px; margin:0 auto 3rem; background:#fff; box-shadow:0 0 20px rgba(0,0,0,0.3); overflow:hidden; }}')
-    parts.append('.page .body { position: relative; }')
-    parts.append('</style>')
-    parts.append('</head>')
-    parts.append('<body>')
-    parts.append('<div class="wrapper">')
-    parts.append(f'<h1>{safe_title}</h1>')
+    yield '<!DOCTYPE html>'
+    yield '<html lang="fr">'
+    yield '<head>'
+    yield '<meta charset="utf-8">'
+    yield f'<title>{safe_title}</title>'
+    yield '<style>'
+    yield css
+    yield 'html, body { margin:0; padding:0; background:#111; font-family: system-ui, -apple-system, BlinkMacSystemFont, "Segoe UI", sans-serif; }'
+    yield 'body { position: static !important; }'
+    yield '.wrapper { max-width: 635px; margin:0 auto; padding:2rem 0; }'
+    yield 'h1 { color:#f5f5f5; text-align:center; margin-bottom:2rem; font-size:1.5rem; font-weight:600; }'
+    yield '.page-label { color:#ccc; text-align:center; margin:0 0 .5rem; font-size:0.85rem; letter-spacing:0.08em; text-transform:uppercase; }'
+    yield f'.page {{ position: relative; width: {PAGE_WIDTH}px; height: {PAGE_HEIGHT}px; margin:0 auto 3rem; background:#fff; box-shadow:0 0 20px rgba(0,0,0,0.3); overflow:hidden; }}'
+    yield '.page .body { position: relative; }'
+    yield '</style>'
+    yield '</head>'
+    yield '<body>'
+    yield '<div class="wrapper">'
+    yield f'<h1>{safe_title}</h1>'
     for idx, content in enumerate(pages, 1):
-        parts.append(f'<p class="page-label">Page {idx}</p>')
-        parts.append(f'<div class="page page-{idx}" id="page-{idx}">')
-        parts.append(content)
-        parts.append('</div>')
-    parts.append('</div>')
-    parts.append('</body>')
-    parts.append('</html>')
-    return '\n'.join(parts)
+        # The page content is yielded on its own rather than formatted into
+        # the template, which would copy the whole (possibly huge) page.
+        yield _PAGE_HEADER % (idx, idx, idx)
+        yield content
+        yield '</div>'
+    yield '</div>'
+    yield '</body>'
+    yield '</html>'
+
+
+def write_html_document(out: BinaryIO, pages: Iterable[str], css: str, title: str) -> None:
+    """Write the final HTML document, UTF‑8 encoded, to the binary stream ``out``.
+
+    The (possibly very large) document is never joined into a single string;
+    each part is encoded and written on its own, and ``pages`` may be a
+    generator so that only the page being written needs to be held in memory.
+    """
+    parts = _html_document_parts(pages, css, title)
+    out.write(next(parts).encode('utf-8'))
+    for part in parts:
+        out.write(b'\n')
+        out.write(part.encode('utf-8'))
 
 
 def convert_epub(epub_path: Path, output_path: Path) -> None:
     """Main conversion routine."""
-    # Create a temporary directory to extract the ePub
-    with tempfile.TemporaryDirectory() as tmpdir:
-        tmp_path = Path(tmpdir)
-        # Unzip ePub
-        with zipfile.ZipFile(epub_path, 'r') as zf:
-            zf.extractall(tmp_path)
+    # Read the ePub entries straight from the archive; nothing is extracted
+    # to disk.
+    with zipfile.ZipFile(epub_path, 'r') as zf:
+        index = _index_archive(zf)
         # Determine the OPS/root directory.  In Apple exports it is often 'OPS',
         # but we search for a directory containing page-*.xhtml.
         root = None
-        for candidate in tmp_path.rglob('page-1.xhtml'):
-            root = candidate.parent
-            break
+        for directory, names in index.items():
+            if any(name.rpartition('/')[2] == 'page-1.xhtml' for name in names):
+                root = directory
+                break
         if root is None:
             # fallback: look for any page-*.xhtml
-            pages_found = list(tmp_path.rglob('page-*.xhtml'))
+            pages_found = find_pages(index, '')
             if not pages_found:
                 raise RuntimeError('Could not locate any page-*.xhtml files in the EPUB')
-            root = pages_found[0].parent
+            root = pages_found[0].rpartition('/')[0]
         # Locate CSS and fonts directories
-        css_text = read_css(root)
-        fonts_dir = root / 'fonts'
-        css_text = embed_fonts(css_text, fonts_dir)
+        css_text = read_css(zf, index, root)
+        font_files = index.get(posixpath.join(root, 'fonts'), [])
+        css_text = embed_fonts(css_text, zf, font_files)
         # Encode images
-        images_dir = root / 'images'
-        images = encode_images(images_dir)
-        # Process pages
-        page_files = find_pages(root)
-        pages_html: List[str] = []
-        for page in page_files:
-            body = extract_body_content(page)
-            if not body:
-                continue
-            body = fix_self_closing(body)
-            body = replace_images_in_html(body, images)
-            # Convert internal links to anchors
-            body = re.sub(r'href="page-(\d+)\.xhtml"', r'href="#page-\1"', body)
-            pages_html.append(body)
-        if not pages_html:
-            raise RuntimeError('No pages could be processed from the EPUB')
-        # Use the input filename stem as document title
-        doc_title = epub_path.stem
-        # Build final document
-        final_html = build_html_document(pages_html, css_text, doc_title)
-        output_path.write_text(final_html, encoding='utf-8')
+        image_files = index.get(posixpath.join(root, 'images'), [])
+        images = encode_images(zf, image_files)
+        # Process pages, writing each one out as soon as it is ready
+        page_files = find_pages(index, root)
+        pages_html = _iter_processed_pages(zf, page_files, images)
+        try:
+            first_page = next(pages_html, None)
+            if first_page is None:
+                raise RuntimeError('No pages could be processed from the EPUB')
+            # Use the input filename stem as document title
+            doc_title = epub_path.stem
+            # Write the final document to a temporary file next to the output
+            # and move it into place only once complete, so that an error on
+            # a later page neither leaves a truncated document behind nor
+            # replaces an existing one.
+            tmp_path = output_path.with_name(f'.{output_path.name}.{os.getpid()}.tmp')
+            try:
+                with open(tmp_path, 'wb', buffering=1 << 20) as out:
+                    write_html_document(out, itertools.chain([first_page], pages_html), css_text, doc_title)
+                os.replace(tmp_path, output_path)
+            except BaseException:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+                raise
+        finally:
+            # Stop the page workers before the archive is closed.
+            pages_html.close()
 
 
 def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace: